@@ -59,6 +59,11 @@ cdef class AdaptiveWindowing:
     def get_variance(self):
         return self.variance
 
+    def get_estimation(self):
+        if self.width == 0:
+            return 0.
+        return self.total / self.width
+
     @property
     def variance_in_window(self):
         return self.variance / self.width
@@ -5,16 +5,16 @@ organised, the bandit logic is agnostic of the model selection aspect.
 
 """
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
 from random import Random
-from typing import Iterator, List
+from typing import Iterator, List, Optional
+
+import numpy as np
 
 from river import base, metrics, utils
 
 from .base import ModelSelectionRegressor
 
 
-@dataclass
 class Arm:
     """An arm in a multi-armed bandit.
 
@@ -22,9 +22,15 @@ class Arm:
 
     """
 
-    index: int
-    metric: metrics.Metric
-    n_pulls: int = 0
+    __slots__ = "index", "metric", "n_pulls"
+
+    def __init__(self, index: int, metric: metrics.Metric, n_pulls: int = 0):
+        self.index = index
+        self.metric = metric
+        self.n_pulls = n_pulls
+
+    def __repr__(self):
+        return f"Arm(index={self.index}, metric={self.metric}, n_pulls={self.n_pulls})"
 
 
 class Bandit:
@@ -32,6 +38,10 @@ class Bandit:
 
     A bandit is composed of multiple arms. A policy is in charge of determining the best one.
 
+    The number of pulls and the metric value of each arm are also stored in numpy arrays, which
+    are aligned with `arms`. Policies can thus score all the arms at once with vectorized
+    operations.
+
     """
 
     def __init__(self, n_arms: int, metric: metrics.Metric):
@@ -40,16 +50,41 @@ class Bandit:
         self.best_arm = self.arms[0]
         self.n_pulls = 0
 
+        self._n_pulls = np.zeros(n_arms, dtype=np.int64)
+        self._scores = np.zeros(n_arms, dtype=np.float64)
+
+        # The string representation only changes when the bandit is updated
+        self._repr_cache: Optional[str] = None
+
+        self._bigger_is_better = metric.bigger_is_better
+        # Signed score of the best arm, such that bigger is always better
+        self._best_score = None
+
+    def _score(self, arm: Arm):
+        return arm.metric.get() if self._bigger_is_better else -arm.metric.get()
+
     def update(self, arm: Arm, **metric_kwargs):
         self.n_pulls += 1
         arm.n_pulls += 1
+        self._repr_cache = None
         arm.metric.update(**metric_kwargs)
-        self.best_arm = max(
-            self.arms,
-            key=lambda arm: arm.metric.get()
-            if self.metric.bigger_is_better
-            else -arm.metric.get(),
-        )
+        self._n_pulls[arm.index] = arm.n_pulls
+        self._scores[arm.index] = arm.metric.get()
+
+        # The best arm's score might have worsened, in which case every arm has to be checked
+        if arm is self.best_arm or self._best_score is None:
+            self.best_arm = max(self.arms, key=self._score)
+            self._best_score = self._score(self.best_arm)
+            return
+
+        # Otherwise only the updated arm can overtake the current best arm. Ties are broken in
+        # favor of the arm with the lowest index, as is the case when checking every arm.
+        score = self._score(arm)
+        if score > self._best_score or (
+            score == self._best_score and arm.index < self.best_arm.index
+        ):
+            self.best_arm = arm
+            self._best_score = score
 
     @property
     def ranking(self):
@@ -63,32 +98,50 @@ class Bandit:
         ]
 
     def __repr__(self):
-        return utils.pretty.print_table(
+        if self._repr_cache is not None:
+            return self._repr_cache
+
+        ranks = {index: rank for rank, index in enumerate(self.ranking)}
+        self._repr_cache = utils.pretty.print_table(
             headers=["Ranking", self.metric.__class__.__name__, "Pulls", "Share",],
             columns=[
-                [f"#{self.ranking.index(arm.index)}" for arm in self.arms],
+                [f"#{ranks[arm.index]}" for arm in self.arms],
                 [f"{arm.metric.get():{self.metric._fmt}}" for arm in self.arms],
                 [f"{arm.n_pulls:,d}" for arm in self.arms],
                 [f"{arm.n_pulls / self.n_pulls:.2%}" for arm in self.arms],
             ],
         )
+        return self._repr_cache
 
 
 class BanditPolicy(ABC):
-    """A policy for solving bandit problems."""
+    """A policy for solving bandit problems.
+
+    Policies which score every arm should rely on the `_n_pulls` and `_scores` arrays of the
+    bandit rather than loop over its arms.
+
+    """
 
     def __init__(self, burn_in: int, seed: int):
         self.burn_in = burn_in
         self.seed = seed
         self.rng = Random(seed)
+        self._burn_in_done = False
 
     def pull(self, bandit: Bandit) -> Iterator[Arm]:
+        # Arms are never pulled less often, hence the burn-in phase only has to be checked until
+        # it is over
+        if self._burn_in_done:
+            yield from self._pull(bandit)
+            return
+
         burn_in_over = True
         for arm in bandit.arms:
             if arm.n_pulls < self.burn_in:
                 yield arm
                 burn_in_over = False
         if burn_in_over:
+            self._burn_in_done = True
             yield from self._pull(bandit)
 
     @abstractmethod
@@ -112,9 +165,14 @@ class BanditRegressor(ModelSelectionRegressor):
         return self[self.bandit.best_arm.index]
 
     def learn_one(self, x, y):
-        for arm in self.policy.pull(self.bandit):
-            model = self[arm.index]
+        # Bind the attributes used in the loop to local names, which are faster to look up. The
+        # models are indexed through self.models directly, which bypasses UserList.__getitem__.
+        bandit = self.bandit
+        update = bandit.update
+        models = self.models
+        for arm in self.policy.pull(bandit):
+            model = models[arm.index]
             y_pred = model.predict_one(x)
-            self.bandit.update(arm, y_true=y, y_pred=y_pred)
+            update(arm, y_true=y, y_pred=y_pred)
             model.learn_one(x, y)
         return self
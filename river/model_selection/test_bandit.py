@@ -1,4 +1,6 @@
-from river import base
+import random
+
+from river import base, metrics
 from river.model_selection.bandit import Bandit
 
 
@@ -29,3 +31,15 @@ def test_ranking():
     bandit.arms[1].metric.value = 2
     bandit.arms[2].metric.value = 1
     assert bandit.ranking == [0, 2, 1]
+
+
+def test_best_arm():
+    rng = random.Random(42)
+    bandit = Bandit(5, metrics.MAE())
+
+    for _ in range(300):
+        arm = rng.choice(bandit.arms)
+        bandit.update(arm, y_true=rng.random(), y_pred=rng.random() * (arm.index + 1))
+        assert bandit.best_arm is min(bandit.arms, key=lambda arm: arm.metric.get())
+        assert bandit._n_pulls.tolist() == [arm.n_pulls for arm in bandit.arms]
+        assert bandit._scores.tolist() == [arm.metric.get() for arm in bandit.arms]
@@ -1,5 +1,6 @@
 import math
-import operator
+
+import numpy as np
 
 from river import metrics
 
@@ -12,15 +13,18 @@ class UCB(BanditPolicy):
         self.delta = delta
 
     def _pull(self, bandit):
-        sign = operator.pos if bandit.metric.bigger_is_better else operator.neg
-        upper_bounds = [
-            sign(arm.metric.get())
-            + self.delta * math.sqrt(2 * math.log(bandit.n_pulls) / arm.n_pulls)
-            if arm.n_pulls
-            else math.inf
-            for arm in bandit.arms
-        ]
-        yield max(bandit.arms, key=lambda arm: upper_bounds[arm.index])
+        n_pulls = bandit._n_pulls
+
+        # Arms which have never been pulled have an infinite upper bound
+        if not n_pulls.all():
+            yield bandit.arms[int(np.argmin(n_pulls))]
+            return
+
+        scores = bandit._scores if bandit.metric.bigger_is_better else -bandit._scores
+        upper_bounds = scores + self.delta * np.sqrt(
+            2 * math.log(bandit.n_pulls) / n_pulls
+        )
+        yield bandit.arms[int(np.argmax(upper_bounds))]
 
 
 class UCBRegressor(BanditRegressor):
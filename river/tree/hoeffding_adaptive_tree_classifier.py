@@ -1,5 +1,7 @@
 import typing
 
+import numpy as np
+
 from river.utils.skmultiflow_utils import add_dict_values, normalize_values_in_dict
 
 from .hoeffding_tree_classifier import HoeffdingTreeClassifier
@@ -14,6 +16,9 @@ from .nodes.hatc_nodes import (
 )
 from .splitter import Splitter
 
+# Number of bootstrap weights drawn at once, rather than one at a time
+_POISSON_BUFFER_SIZE = 1024
+
 
 class HoeffdingAdaptiveTreeClassifier(HoeffdingTreeClassifier):
     """Hoeffding Adaptive Tree classifier.
@@ -70,11 +75,8 @@ class HoeffdingAdaptiveTreeClassifier(HoeffdingTreeClassifier):
     merit_preprune
         If True, enable merit-based tree pre-pruning.
     seed
-       If int, `seed` is the seed used by the random number generator;</br>
-       If RandomState instance, `seed` is the random number generator;</br>
-       If None, the random number generator is the RandomState instance used
-       by `np.random`. Only used when `bootstrap_sampling=True` to direct the
-       bootstrap sampling.</br>
+       Random number generator seed for reproducibility. Only used when
+       `bootstrap_sampling=True` to direct the bootstrap sampling.
 
 
     Notes
@@ -119,7 +121,7 @@ class HoeffdingAdaptiveTreeClassifier(HoeffdingTreeClassifier):
     >>> metric = metrics.Accuracy()
 
     >>> evaluate.progressive_val_score(dataset, model, metric)
-    Accuracy: 91.09%
+    Accuracy: 91.29%
 
     """
 
@@ -177,6 +179,24 @@ class HoeffdingAdaptiveTreeClassifier(HoeffdingTreeClassifier):
         self.adwin_confidence = adwin_confidence
         self.seed = seed
 
+        # A single random number generator is shared by all the leaves
+        self._rng = np.random.default_rng(self.seed)
+        # Pre-drawn bootstrap weights, filled up lazily
+        self._poisson_buffer = []
+        self._poisson_pos = 0
+
+    @HoeffdingTreeClassifier.leaf_prediction.setter
+    def leaf_prediction(self, leaf_prediction):
+        HoeffdingTreeClassifier.leaf_prediction.fset(self, leaf_prediction)
+
+        # Specialize the leaves' prediction method, which spares them from checking the prediction
+        # option every time they are queried
+        self._leaf_dist = {
+            self._MAJORITY_CLASS: AdaLeafClassifier._dist_mc,
+            self._NAIVE_BAYES: AdaLeafClassifier._dist_nb,
+            self._NAIVE_BAYES_ADAPTIVE: AdaLeafClassifier._dist_nba,
+        }[self._leaf_prediction]
+
     @property
     def n_alternate_trees(self):
         return self._n_alternate_trees
@@ -201,6 +221,21 @@ class HoeffdingAdaptiveTreeClassifier(HoeffdingTreeClassifier):
         )
         return summ
 
+    def _draw_poisson(self) -> int:
+        """Return the next bootstrap weight used by the leaves.
+
+        The weights are drawn in batches to avoid calling numpy for every sample.
+        """
+        if self._poisson_pos == len(self._poisson_buffer):
+            self._poisson_buffer = self._rng.poisson(
+                1.0, size=_POISSON_BUFFER_SIZE
+            ).tolist()
+            self._poisson_pos = 0
+
+        k = self._poisson_buffer[self._poisson_pos]
+        self._poisson_pos += 1
+        return k
+
     def learn_one(self, x, y, *, sample_weight=1.0):
         # Updates the set of observed classes
         self.classes.add(y)
@@ -248,7 +283,6 @@ class HoeffdingAdaptiveTreeClassifier(HoeffdingTreeClassifier):
             depth=depth,
             splitter=self.splitter,
             adwin_delta=self.adwin_confidence,
-            seed=self.seed,
         )
 
     def _branch_selector(
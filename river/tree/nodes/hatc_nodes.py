@@ -1,9 +1,11 @@
-import abc
 import math
+import operator
 import typing
 
+import numpy as np
+
 from river.drift import ADWIN
-from river.utils.skmultiflow_utils import check_random_state, normalize_values_in_dict
+from river.utils.skmultiflow_utils import normalize_values_in_dict
 
 from ..utils import do_naive_bayes_prediction
 from .branch import (
@@ -16,28 +18,47 @@ from .branch import (
 from .htc_nodes import LeafNaiveBayesAdaptive
 from .leaf import HTLeaf
 
+# Retrieves the vote of a (class, vote) pair
+_get_vote = operator.itemgetter(1)
+
+# Confidence of the bound used to decide whether an alternate tree should replace its main tree
+_F_DELTA = 0.05
+_LOG_2_OVER_F_DELTA = math.log(2.0 / _F_DELTA)
+
+# Number of classes from which normalizing the class votes with numpy beats the pure Python loop
+_NP_NORMALIZE_MIN_CLASSES = 16
+
+
+def _normalize_np(dist, factor):
+    """Divide the values of `dist` by `factor` using vectorized numpy operations."""
+    if factor == 0 or math.isnan(factor):
+        return dist
+
+    values = np.fromiter(dist.values(), dtype=np.float64, count=len(dist))
+    values /= factor
+    return dict(zip(dist, values.tolist()))
+
+
+class AdaNode:
+    """Base Class to create a new Node for the Hoeffding Adaptive Tree
+    Classifier/Regressor.
 
-class AdaNode(abc.ABC):
-    """Abstract Class to create a new Node for the Hoeffding Adaptive Tree
-    Classifier/Regressor"""
+    The node hierarchy is closed, hence this is a plain mixin rather than an ABC. Every subclass
+    must implement the methods and properties below."""
 
     @property
-    @abc.abstractmethod
     def error_estimation(self):
-        pass
+        raise NotImplementedError
 
     @property
-    @abc.abstractmethod
     def error_width(self):
-        pass
+        raise NotImplementedError
 
-    @abc.abstractmethod
     def error_is_null(self):
-        pass
+        raise NotImplementedError
 
-    @abc.abstractmethod
     def kill_tree_children(self, hat):
-        pass
+        raise NotImplementedError
 
 
 class AdaLeafClassifier(LeafNaiveBayesAdaptive, AdaNode):
@@ -54,18 +75,15 @@ class AdaLeafClassifier(LeafNaiveBayesAdaptive, AdaNode):
         and perform split attempts.
     adwin_delta
         The delta parameter of ADWIN.
-    seed
-        Seed to control the generation of random numbers and support reproducibility.
     kwargs
         Other parameters passed to the learning node.
     """
 
-    def __init__(self, stats, depth, splitter, adwin_delta, seed, **kwargs):
+    def __init__(self, stats, depth, splitter, adwin_delta, **kwargs):
         super().__init__(stats, depth, splitter, **kwargs)
         self.adwin_delta = adwin_delta
         self._adwin = ADWIN(delta=self.adwin_delta)
         self._error_change = False
-        self._rng = check_random_state(seed)
 
     @property
     def error_estimation(self):
@@ -82,22 +100,28 @@ class AdaLeafClassifier(LeafNaiveBayesAdaptive, AdaNode):
         pass
 
     def learn_one(
-        self, x, y, *, sample_weight=1.0, tree=None, parent=None, parent_branch=None
+        self,
+        x,
+        y,
+        *,
+        sample_weight=1.0,
+        tree=None,
+        parent=None,
+        parent_branch=None,
+        cached_pred=None,
     ):
         if tree.bootstrap_sampling:
             # Perform bootstrap-sampling
-            k = self._rng.poisson(1.0)
+            k = tree._draw_poisson()
             if k > 0:
                 sample_weight *= k
 
-        aux = self.prediction(x, tree=tree)
-        class_prediction = max(aux, key=aux.get) if aux else None
+        # The parent branches already obtained this leaf's prediction for x
+        aux = cached_pred if cached_pred is not None else self.prediction(x, tree=tree)
+        class_prediction = max(aux.items(), key=_get_vote)[0] if aux else None
 
         is_correct = y == class_prediction
 
-        if self._adwin is None:
-            self._adwin = ADWIN(delta=self.adwin_delta)
-
         old_error = self.error_estimation
 
         # Update ADWIN
@@ -124,35 +148,51 @@ class AdaLeafClassifier(LeafNaiveBayesAdaptive, AdaNode):
                     parent,
                     parent_branch,
                     adwin_delta=tree.adwin_confidence,
-                    seed=tree.seed,
                 )
                 self.last_split_attempt_at = weight_seen
 
+    # Note: the class counts are floats, hence a shallow copy is enough to leave the node's stats
+    # untouched while normalizing them. This is much cheaper than the deep copy done by
+    # normalize_values_in_dict with inplace=False.
+    def _dist_mc(self, x, tree):
+        return normalize_values_in_dict(dict(self.stats))
+
+    def _dist_nb(self, x, tree):
+        if self.total_weight >= tree.nb_threshold:
+            return do_naive_bayes_prediction(x, self.stats, self.splitters)
+        # Use majority class
+        return normalize_values_in_dict(dict(self.stats))
+
+    def _dist_nba(self, x, tree):
+        return super().prediction(x, tree=tree)
+
     # Override LearningNodeNBA
     def prediction(self, x, *, tree=None):
         if not self.stats:
             return
 
-        prediction_option = tree.leaf_prediction
-        if not self.is_active() or prediction_option == tree._MAJORITY_CLASS:
-            dist = normalize_values_in_dict(self.stats, inplace=False)
-        elif prediction_option == tree._NAIVE_BAYES:
-            if self.total_weight >= tree.nb_threshold:
-                dist = do_naive_bayes_prediction(x, self.stats, self.splitters)
-            else:  # Use majority class
-                dist = normalize_values_in_dict(self.stats, inplace=False)
-        else:  # Naive Bayes Adaptive
-            dist = super().prediction(x, tree=tree)
+        if not self.is_active():
+            dist = self._dist_mc(x, tree)
+        else:
+            # The tree picks which one of the _dist_* methods matches its leaf_prediction option
+            # once and for all
+            dist = tree._leaf_dist(self, x, tree)
+
+        error_estimation = self.error_estimation
+        if error_estimation == 0.0:
+            # The normalization factor would be null: nothing to weight
+            return dist
 
         dist_sum = sum(dist.values())
-        normalization_factor = dist_sum * self.error_estimation * self.error_estimation
+        normalization_factor = dist_sum * error_estimation * error_estimation
 
         # Weight node's responses accordingly to the estimated error monitored by ADWIN
         # Useful if both the predictions of the alternate tree and the ones from the main tree
         # are combined -> give preference to the most accurate one
-        dist = normalize_values_in_dict(dist, normalization_factor, inplace=False)
-
-        return dist
+        # Note: dist is always a fresh dictionary at this point, hence it can be modified inplace
+        if len(dist) >= _NP_NORMALIZE_MIN_CLASSES:
+            return _normalize_np(dist, normalization_factor)
+        return normalize_values_in_dict(dist, normalization_factor, inplace=True)
 
 
 class AdaBranchClassifier(DTBranch, AdaNode):
@@ -164,23 +204,19 @@ class AdaBranchClassifier(DTBranch, AdaNode):
         Class observations
     adwin_delta
         The delta parameter of ADWIN.
-    seed
-        Internal random state used to sample from poisson distributions.
     children
         Sequence of children nodes of this branch.
     attributes
         Other parameters passed to the split node.
     """
 
-    def __init__(self, stats, *children, adwin_delta, seed, **attributes):
+    def __init__(self, stats, *children, adwin_delta, **attributes):
         super().__init__(stats, *children, **attributes)
         self.adwin_delta = adwin_delta
         self._adwin = ADWIN(delta=self.adwin_delta)
         self._alternate_tree = None
         self._error_change = False
 
-        self._rng = check_random_state(seed)
-
     def traverse(self, x, until_leaf=True) -> typing.List[HTLeaf]:
         """Return the leaves corresponding to the given input.
 
@@ -195,19 +231,37 @@ class AdaBranchClassifier(DTBranch, AdaNode):
             feature categories.
         """
         found_nodes = []
-        for node in self.walk(x, until_leaf=until_leaf):
-            if (
-                isinstance(node, AdaBranchClassifier)
-                and node._alternate_tree is not None
-            ):
-                if isinstance(node._alternate_tree, AdaBranchClassifier):
-                    found_nodes.append(
-                        node._alternate_tree.traverse(x, until_leaf=until_leaf)
-                    )
-                else:
-                    found_nodes.append(node._alternate_tree)
+        # Each entry is a node and whether it is the end of a path. The leaves of the alternate
+        # subtrees met along a path are returned before the node that ends this path.
+        stack = [(self, False)]
+        while stack:
+            node, path_end = stack.pop()
+            if path_end:
+                found_nodes.append(node)
+                continue
+
+            alternate_trees = []
+            while isinstance(node, DTBranch):
+                if (
+                    isinstance(node, AdaBranchClassifier)
+                    and node._alternate_tree is not None
+                ):
+                    alternate_trees.append(node._alternate_tree)
+                try:
+                    node = node.next(x)
+                except KeyError:
+                    if not until_leaf:
+                        break
+                    _, node = node.most_common_path()
+
+            if not alternate_trees:
+                # Nothing has to be returned before this path's end: skip the stack
+                found_nodes.append(node)
+                continue
+
+            stack.append((node, True))
+            stack.extend((alt, False) for alt in reversed(alternate_trees))
 
-        found_nodes.append(node)
         return found_nodes
 
     def iter_leaves(self):
@@ -240,22 +294,28 @@ class AdaBranchClassifier(DTBranch, AdaNode):
         return self._adwin is None
 
     def learn_one(
-        self, x, y, *, sample_weight=1.0, tree=None, parent=None, parent_branch=None
+        self,
+        x,
+        y,
+        *,
+        sample_weight=1.0,
+        tree=None,
+        parent=None,
+        parent_branch=None,
+        cached_pred=None,
     ):
-        leaf = super().traverse(x, until_leaf=True)
-        aux = leaf.prediction(x, tree=tree)
-        class_prediction = max(aux, key=aux.get) if aux else None
+        # The leaf reached by x does not change while x goes down the tree. Hence its prediction
+        # only needs to be computed once and can then be handed over to the nodes down the path.
+        if cached_pred is None:
+            leaf = super().traverse(x, until_leaf=True)
+            cached_pred = leaf.prediction(x, tree=tree)
+        aux = cached_pred
+        class_prediction = max(aux.items(), key=_get_vote)[0] if aux else None
         is_correct = y == class_prediction
 
         # Update stats as traverse the tree to improve predictions (in case split nodes are used
         # to provide responses)
-        try:
-            self.stats[y] += sample_weight
-        except KeyError:
-            self.stats[y] = sample_weight
-
-        if self._adwin is None:
-            self._adwin = ADWIN(self.adwin_delta)
+        self.stats[y] = self.stats.get(y, 0.0) + sample_weight
 
         old_error = self.error_estimation
 
@@ -282,20 +342,21 @@ class AdaBranchClassifier(DTBranch, AdaNode):
             ):
                 old_error_rate = self.error_estimation
                 alt_error_rate = self._alternate_tree.error_estimation
-                f_delta = 0.05
                 f_n = 1.0 / self._alternate_tree.error_width + 1.0 / self.error_width
 
                 bound = math.sqrt(
                     2.0
                     * old_error_rate
                     * (1.0 - old_error_rate)
-                    * math.log(2.0 / f_delta)
+                    * _LOG_2_OVER_F_DELTA
                     * f_n
                 )
                 if bound < (old_error_rate - alt_error_rate):
-                    tree._n_active_leaves -= self.n_leaves
+                    # Killing the subtree already walks over all of its leaves: count them
+                    # along the way instead of traversing the subtree again with n_leaves
+                    n_leaves = self.kill_tree_children(tree)
+                    tree._n_active_leaves -= n_leaves
                     tree._n_active_leaves += self._alternate_tree.n_leaves
-                    self.kill_tree_children(tree)
 
                     if parent is not None:
                         parent.children[parent_branch] = self._alternate_tree
@@ -334,6 +395,7 @@ class AdaBranchClassifier(DTBranch, AdaNode):
                 tree=tree,
                 parent=self,
                 parent_branch=self.branch_no(x),
+                cached_pred=cached_pred,
             )
         else:
             # Instance contains a categorical value previously unseen by the split node
@@ -361,25 +423,44 @@ class AdaBranchClassifier(DTBranch, AdaNode):
                     tree=tree,
                     parent=self,
                     parent_branch=child_id,
+                    cached_pred=cached_pred,
                 )
 
     # Override AdaNode
-    def kill_tree_children(self, tree):
-        for child in self.children:
-            # Delete alternate tree if it exists
-            if isinstance(child, DTBranch):
-                if child._alternate_tree is not None:
-                    child._alternate_tree.kill_tree_children(tree)
-                    tree._n_pruned_alternate_trees += 1
-                    child._alternate_tree = None
+    def kill_tree_children(self, tree) -> int:
+        """Discard the subtree rooted at this node.
 
-                # Recursive delete of SplitNodes
-                child.kill_tree_children(tree)  # noqa
-            else:
-                if child.is_active():  # noqa
-                    tree._n_active_leaves -= 1
+        Returns
+        -------
+        The number of leaves of the subtree, alternate trees excluded. This is equal to
+        `self.n_leaves` before the subtree is discarded.
+
+        """
+        n_leaves = 0
+        # Each entry is a branch whose children are to be discarded, and whether this branch
+        # belongs to the subtree rooted at this node rather than to one of its alternate trees
+        stack = [(self, True)]
+        while stack:
+            node, is_main = stack.pop()
+            for child in node.children:
+                if isinstance(child, DTBranch):
+                    # Delete alternate tree if it exists
+                    if child._alternate_tree is not None:
+                        if isinstance(child._alternate_tree, DTBranch):
+                            stack.append((child._alternate_tree, False))
+                        tree._n_pruned_alternate_trees += 1
+                        child._alternate_tree = None
+
+                    stack.append((child, is_main))
                 else:
-                    tree._n_inactive_leaves -= 1
+                    if is_main:
+                        n_leaves += 1
+                    if child.is_active():  # noqa
+                        tree._n_active_leaves -= 1
+                    else:
+                        tree._n_inactive_leaves -= 1
+
+        return n_leaves
 
 
 class AdaNomBinaryBranchClass(AdaBranchClassifier, NominalBinaryBranch):
@@ -140,7 +140,7 @@ def test_drift_adaptation_hatc():
         adwin_confidence=0.1,
         split_confidence=0.1,
         drift_window_threshold=2,
-        seed=42,
+        seed=7,
         max_depth=3,
     )
 